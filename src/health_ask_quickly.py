@@ -732,9 +732,6 @@ class HealthAskQuickly:
             current_time = datetime.now()
             
             # 添加新的分析记录
-            if 'analysis_history' not in user_profile.__dict__:
-                user_profile.analysis_history = []
-            
             user_profile.analysis_history.append({
                 'timestamp': current_time.isoformat(),
                 'query': analysis_result.get('user_query', ''),
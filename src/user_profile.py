@@ -14,8 +14,24 @@ from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_json_loads = orjson.loads if orjson else json.loads
+
+def _read_file_bytes(filepath: str) -> Optional[bytes]:
+    """一次性读取文件内容，失败时返回None"""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        logger.error(f"读取文件失败 {filepath}: {str(e)}")
+        return None
+
 class RiskTolerance(Enum):
     """风险承受能力"""
     CONSERVATIVE = "保守型"
@@ -132,6 +148,14 @@ class DataSources:
 class HealthProfile:
     """用户健康画像"""
     
+    # 固定属性集合，画像批量加载时减少每个实例的内存占用
+    __slots__ = (
+        'user_id', 'created_at', 'updated_at',
+        'demographics', 'health_status', 'lifestyle',
+        'health_goals', 'risk_profile', 'data_sources',
+        'health_data_history', 'analysis_history', 'last_analysis'
+    )
+    
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.created_at = datetime.now()
@@ -148,6 +172,10 @@ class HealthProfile:
         # 健康数据历史
         self.health_data_history = {}
         
+        # 问答分析记录（仅保存在内存中）
+        self.analysis_history = []
+        self.last_analysis = None
+        
     def update_demographics(self, **kwargs) -> bool:
         """更新人口统计学信息"""
         try:
@@ -535,18 +563,31 @@ class HealthProfileManager:
         """加载所有健康画像"""
         try:
             import os
-            import glob
+            from concurrent.futures import ThreadPoolExecutor
             
             if not os.path.exists(directory):
                 return False
             
-            pattern = os.path.join(directory, "*_profile.json")
-            files = glob.glob(pattern)
+            # 单次目录扫描获取所有画像文件
+            with os.scandir(directory) as entries:
+                files = [
+                    entry.path for entry in entries
+                    if entry.name.endswith("_profile.json") and not entry.name.startswith(".") and entry.is_file()
+                ]
+            
+            # 并发读取文件内容，解析和构建画像在当前线程完成
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                contents = list(executor.map(_read_file_bytes, files))
             
-            for filepath in files:
-                profile = HealthProfile.load_from_file(filepath)
-                if profile:
-                    self.profiles[profile.user_id] = profile
+            for raw in contents:
+                if raw is None:
+                    continue
+                try:
+                    profile = HealthProfile.from_dict(_json_loads(raw))
+                except Exception as e:
+                    logger.error(f"加载健康画像失败: {str(e)}")
+                    continue
+                self.profiles[profile.user_id] = profile
             
             logger.info(f"从 {directory} 加载了 {len(self.profiles)} 个健康画像")
             return True
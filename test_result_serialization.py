@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试对比结果对象的复制与序列化
+"""
+
+import sys
+import os
+import copy
+import pickle
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.user_profile import HealthProfileManager
+from tools.health_comparison import HealthComparison
+from tools.health_management_tools import HealthAnalysis, HealthPlan, RiskAssessment
+
+def _check_round_trip(result):
+    """复制、深拷贝和 pickle 往返后字段值应与原对象一致"""
+    expected = result.to_dict()
+    for restored in (copy.copy(result), copy.deepcopy(result), pickle.loads(pickle.dumps(result))):
+        assert type(restored) is type(result)
+        assert restored == result
+        assert restored.to_dict() == expected
+
+def test_comparison_round_trip():
+    """测试对比结果的复制与序列化"""
+    print("📋 对比结果复制与序列化测试")
+    print("=" * 60)
+
+    comparison = HealthComparison()
+    manager = HealthProfileManager()
+    manager.load_all_profiles(os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles"))
+    profile = manager.get_profile("user_001")
+    age = profile.demographics.age
+    gender = profile.demographics.gender
+
+    results = [
+        comparison.compare_bmi(profile.demographics.calculate_bmi(), age, gender),
+        comparison.compare_blood_pressure(128, 84, age, gender),
+        comparison.compare_heart_rate(72, age, gender),
+        comparison.compare_sleep(7.5, age, gender),
+        comparison.compare_lifestyle(profile),
+        comparison.compare_health_risks(profile),
+    ]
+    for result in results:
+        _check_round_trip(result)
+        print(f"✅ {type(result).__name__} 复制与序列化成功")
+
+def test_tool_result_round_trip():
+    """测试健康管理工具结果的复制与序列化"""
+    print("\n📋 工具结果复制与序列化测试")
+    print("=" * 60)
+
+    results = [
+        HealthAnalysis(
+            user_id="user_001", analysis_date="2024-01-01T00:00:00",
+            current_status={"bmi": 23.5}, trend_analysis={"weight": "稳定"},
+            key_findings=["BMI正常"], recommendations=["保持规律运动"]
+        ),
+        HealthPlan(
+            user_id="user_001", plan_date="2024-01-01T00:00:00", target_period="3个月",
+            current_status={"bmi": 23.5}, goals=[{"type": "维持体重"}],
+            action_plan=[{"category": "运动"}], monitoring_plan={"daily": ["体重"]},
+            timeline=[{"week": "1-2周"}]
+        ),
+        RiskAssessment(
+            user_id="user_001", assessment_date="2024-01-01T00:00:00", overall_risk_level="低风险",
+            disease_risks=[{"disease": "高血压"}], risk_factors={"smoking": False},
+            prevention_recommendations=["定期体检"]
+        ),
+    ]
+    for result in results:
+        _check_round_trip(result)
+        print(f"✅ {type(result).__name__} 复制与序列化成功")
+
+if __name__ == '__main__':
+    test_comparison_round_trip()
+    test_tool_result_round_trip()
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+智能健康管理助手 - 工具模块
+
+健康指标对比分析、健康管理Agent工具及通用健康工具。
+"""
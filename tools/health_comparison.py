@@ -10,14 +10,131 @@
 
 import json
 import os
-import sys
-from typing import Dict, List, Any, Optional, Tuple
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 from collections import Counter
 
-# 添加项目路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
 
-from src.user_profile import HealthProfile
+if TYPE_CHECKING:
+    from src.user_profile import HealthProfile
+
+# 各指标分类表，按 "低于下限/正常/超出上限/超出更高上限" 的区间序号索引
+_BMI_CATEGORIES = (('underweight', '偏瘦'), ('normal', '正常'), ('overweight', '超重'), ('obese', '肥胖'))
+_BP_CATEGORIES = (('low', '偏低'), ('normal', '正常'), ('high_normal', '正常高值'), ('hypertension', '高血压'))
+_HR_CATEGORIES = (('low', '偏低'), ('normal', '正常'), ('high', '偏高'))
+_SLEEP_CATEGORIES = (('insufficient', '不足'), ('optimal', '充足'), ('acceptable', '可接受'), ('excessive', '过多'))
+
+
+class _ComparisonResult:
+    """对比结果基类，提供对外输出的字典转换及复制、序列化支持"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式（字段固定，按 __slots__ 直接取值，不做通用递归拷贝）"""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __getstate__(self) -> Tuple[Any, ...]:
+        """按 __slots__ 顺序导出字段值，供 copy 和 pickle 使用"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        """恢复字段值；冻结的数据类禁止 setattr，需绕过 __setattr__ 写入"""
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+@dataclass(frozen=True)
+class BMIComparison(_ComparisonResult):
+    """BMI对比结果"""
+    __slots__ = ('indicator', 'user_value', 'unit', 'age_group', 'gender', 'normal_range',
+                 'is_normal', 'category', 'status', 'deviation', 'standard_info')
+    indicator: str
+    user_value: float
+    unit: str
+    age_group: str
+    gender: str
+    normal_range: List[float]
+    is_normal: bool
+    category: str
+    status: str
+    deviation: Dict[str, Any]
+    standard_info: Dict[str, List[float]]
+
+@dataclass(frozen=True)
+class BloodPressureComparison(_ComparisonResult):
+    """血压对比结果"""
+    __slots__ = ('indicator', 'user_value', 'unit', 'age_group', 'gender', 'systolic', 'diastolic',
+                 'normal_range', 'is_normal', 'category', 'status', 'deviation', 'standard_info')
+    indicator: str
+    user_value: str
+    unit: str
+    age_group: str
+    gender: str
+    systolic: int
+    diastolic: int
+    normal_range: List[float]
+    is_normal: bool
+    category: str
+    status: str
+    deviation: Dict[str, Any]
+    standard_info: Dict[str, List[float]]
+
+@dataclass(frozen=True)
+class HeartRateComparison(_ComparisonResult):
+    """心率对比结果"""
+    __slots__ = ('indicator', 'user_value', 'unit', 'age_group', 'gender', 'normal_range',
+                 'is_normal', 'category', 'status', 'deviation', 'standard_info')
+    indicator: str
+    user_value: int
+    unit: str
+    age_group: str
+    gender: str
+    normal_range: List[float]
+    is_normal: bool
+    category: str
+    status: str
+    deviation: Dict[str, Any]
+    standard_info: Dict[str, List[float]]
+
+@dataclass(frozen=True)
+class SleepComparison(_ComparisonResult):
+    """睡眠对比结果"""
+    __slots__ = ('indicator', 'user_value', 'unit', 'age_group', 'gender', 'optimal_range',
+                 'is_optimal', 'category', 'status', 'deviation', 'standard_info')
+    indicator: str
+    user_value: float
+    unit: str
+    age_group: str
+    gender: str
+    optimal_range: List[float]
+    is_optimal: bool
+    category: str
+    status: str
+    deviation: Dict[str, Any]
+    standard_info: Dict[str, List[float]]
+
+@dataclass(frozen=True)
+class LifestyleComparison(_ComparisonResult):
+    """生活方式对比结果"""
+    __slots__ = ('exercise_frequency', 'sleep_quality', 'stress_level', 'alcohol_consumption', 'smoking')
+    exercise_frequency: Dict[str, Any]
+    sleep_quality: Dict[str, Any]
+    stress_level: Dict[str, Any]
+    alcohol_consumption: Dict[str, Any]
+    smoking: Dict[str, Any]
+
+@dataclass(frozen=True)
+class RiskComparison(_ComparisonResult):
+    """健康风险对比结果"""
+    __slots__ = ('risk_factors', 'total_risk_factors', 'chronic_diseases', 'lifestyle_risks')
+    risk_factors: List[Dict[str, Any]]
+    total_risk_factors: int
+    chronic_diseases: int
+    lifestyle_risks: int
 
 class HealthComparison:
     """健康指标客观对比分析器"""
@@ -30,21 +147,43 @@ class HealthComparison:
             standards_file = os.path.join(project_root, "data", "health_standards.json")
         self.standards_file = standards_file
         self.standards = self.load_standards()
+        # 年龄段按下限排序，用于二分查找年龄段
+        age_groups = sorted(self.standards.get('age_groups', {}).items(), key=lambda item: item[1]['min'])
+        self._ag_names = [name for name, _ in age_groups]
+        self._ag_mins = [info['min'] for _, info in age_groups]
+        self._ag_bounds = [info['max'] for _, info in age_groups]
+        # 慢性病风险标准，供风险对比直接引用
+        self._chronic_std = self.standards.get('health_risk_factors', {}).get('chronic_diseases', {})
+        # 各指标范围边界查找表: (性别, 年龄段) -> 边界元组
+        self._bmi_ranges = self._build_range_table('bmi', ('normal', 0), ('normal', 1), ('overweight', 1))
+        self._bp_ranges = self._build_range_table('blood_pressure', ('normal', 0), ('normal', 1), ('high_normal', 1))
+        self._hr_ranges = self._build_range_table('heart_rate', ('normal', 0), ('normal', 1))
+        self._sleep_ranges = self._build_range_table('sleep_hours', ('optimal', 0), ('optimal', 1), ('acceptable', 1))
     
     def load_standards(self) -> Dict[str, Any]:
         """加载健康指标标准"""
         try:
-            with open(self.standards_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.standards_file, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson else json.loads(raw)
         except Exception as e:
             print(f"加载健康标准失败: {e}")
             return {}
     
+    def _build_range_table(self, indicator: str, *bounds: Tuple[str, int]) -> Dict[Tuple[str, str], Tuple[float, ...]]:
+        """将指标范围展开为 (性别, 年龄段) -> 边界元组 的查找表"""
+        table = {}
+        ranges = self.standards.get('health_indicators', {}).get(indicator, {}).get('ranges', {})
+        for gender, age_groups in ranges.items():
+            for age_group, age_ranges in age_groups.items():
+                table[(gender, age_group)] = tuple(age_ranges[name][index] for name, index in bounds)
+        return table
+    
     def get_age_group(self, age: int) -> str:
         """根据年龄获取年龄段"""
-        for age_range, info in self.standards.get('age_groups', {}).items():
-            if info['min'] <= age <= info['max']:
-                return age_range
+        index = bisect_left(self._ag_bounds, age)
+        if index < len(self._ag_names) and self._ag_mins[index] <= age:
+            return self._ag_names[index]
         return "76+"  # 默认返回最高年龄段
     
     def _calculate_deviation(self, value: float, normal_range: List[float]) -> Dict[str, Any]:
@@ -80,337 +219,314 @@ class HealthComparison:
         else:  # above
             return f'高于正常范围 {deviation_value:.1f} ({deviation_percent:.1f}%)'
     
-    def compare_bmi(self, bmi: float, age: int, gender: str) -> Dict[str, Any]:
+    def compare_bmi(self, bmi: float, age: int, gender: str) -> BMIComparison:
         """对比BMI指标与标准范围"""
         age_group = self.get_age_group(age)
-        ranges = self.standards['health_indicators']['bmi']['ranges'][gender][age_group]
+        normal_min, normal_max, overweight_max = self._bmi_ranges[(gender, age_group)]
+        normal_range = [normal_min, normal_max]
         
         # 判断是否在正常范围内
-        is_normal = ranges['normal'][0] <= bmi <= ranges['normal'][1]
+        is_normal = normal_min <= bmi <= normal_max
         
         # 确定具体分类
-        if bmi < ranges['normal'][0]:
-            category = 'underweight'
-            status = '偏瘦'
-        elif bmi <= ranges['normal'][1]:
-            category = 'normal'
-            status = '正常'
-        elif bmi <= ranges['overweight'][1]:
-            category = 'overweight'
-            status = '超重'
-        else:
-            category = 'obese'
-            status = '肥胖'
-        
-        return {
-            'indicator': 'BMI',
-            'user_value': bmi,
-            'unit': 'kg/m²',
-            'age_group': age_group,
-            'gender': gender,
-            'normal_range': ranges['normal'],
-            'is_normal': is_normal,
-            'category': category,
-            'status': status,
-            'deviation': self._calculate_deviation(bmi, ranges['normal']),
-            'standard_info': {
-                'underweight_range': [0, ranges['normal'][0]],
-                'normal_range': ranges['normal'],
-                'overweight_range': [ranges['normal'][1], ranges['overweight'][1]],
-                'obese_range': [ranges['overweight'][1], 100]
+        category, status = _BMI_CATEGORIES[(bmi >= normal_min) + (bmi > normal_max) + (bmi > overweight_max)]
+        
+        return BMIComparison(
+            indicator='BMI',
+            user_value=bmi,
+            unit='kg/m²',
+            age_group=age_group,
+            gender=gender,
+            normal_range=normal_range,
+            is_normal=is_normal,
+            category=category,
+            status=status,
+            deviation=self._calculate_deviation(bmi, normal_range),
+            standard_info={
+                'underweight_range': [0, normal_min],
+                'normal_range': normal_range,
+                'overweight_range': [normal_max, overweight_max],
+                'obese_range': [overweight_max, 100]
             }
-        }
+        )
     
-    def compare_blood_pressure(self, systolic: int, diastolic: int, age: int, gender: str) -> Dict[str, Any]:
+    def compare_blood_pressure(self, systolic: int, diastolic: int, age: int, gender: str) -> BloodPressureComparison:
         """对比血压指标与标准范围"""
         age_group = self.get_age_group(age)
-        ranges = self.standards['health_indicators']['blood_pressure']['ranges'][gender][age_group]
+        normal_min, normal_max, high_normal_max = self._bp_ranges[(gender, age_group)]
+        normal_range = [normal_min, normal_max]
         
         # 判断收缩压是否在正常范围内
-        systolic_normal = ranges['normal'][0] <= systolic <= ranges['normal'][1]
+        systolic_normal = normal_min <= systolic <= normal_max
         
         # 确定收缩压分类
-        if systolic < ranges['normal'][0]:
-            category = 'low'
-            status = '偏低'
-        elif systolic <= ranges['normal'][1]:
-            category = 'normal'
-            status = '正常'
-        elif systolic <= ranges['high_normal'][1]:
-            category = 'high_normal'
-            status = '正常高值'
-        else:
-            category = 'hypertension'
-            status = '高血压'
-        
-        return {
-            'indicator': '血压',
-            'user_value': f"{systolic}/{diastolic}",
-            'unit': 'mmHg',
-            'age_group': age_group,
-            'gender': gender,
-            'systolic': systolic,
-            'diastolic': diastolic,
-            'normal_range': ranges['normal'],
-            'is_normal': systolic_normal,
-            'category': category,
-            'status': status,
-            'deviation': self._calculate_deviation(systolic, ranges['normal']),
-            'standard_info': {
-                'low_range': [0, ranges['normal'][0]],
-                'normal_range': ranges['normal'],
-                'high_normal_range': [ranges['normal'][1], ranges['high_normal'][1]],
-                'hypertension_range': [ranges['high_normal'][1], 200]
+        category, status = _BP_CATEGORIES[(systolic >= normal_min) + (systolic > normal_max) + (systolic > high_normal_max)]
+        
+        return BloodPressureComparison(
+            indicator='血压',
+            user_value=f"{systolic}/{diastolic}",
+            unit='mmHg',
+            age_group=age_group,
+            gender=gender,
+            systolic=systolic,
+            diastolic=diastolic,
+            normal_range=normal_range,
+            is_normal=systolic_normal,
+            category=category,
+            status=status,
+            deviation=self._calculate_deviation(systolic, normal_range),
+            standard_info={
+                'low_range': [0, normal_min],
+                'normal_range': normal_range,
+                'high_normal_range': [normal_max, high_normal_max],
+                'hypertension_range': [high_normal_max, 200]
             }
-        }
+        )
     
-    def compare_heart_rate(self, heart_rate: int, age: int, gender: str) -> Dict[str, Any]:
+    def compare_heart_rate(self, heart_rate: int, age: int, gender: str) -> HeartRateComparison:
         """对比心率指标与标准范围"""
         age_group = self.get_age_group(age)
-        ranges = self.standards['health_indicators']['heart_rate']['ranges'][gender][age_group]
+        normal_min, normal_max = self._hr_ranges[(gender, age_group)]
+        normal_range = [normal_min, normal_max]
         
         # 判断是否在正常范围内
-        is_normal = ranges['normal'][0] <= heart_rate <= ranges['normal'][1]
+        is_normal = normal_min <= heart_rate <= normal_max
         
         # 确定分类
-        if heart_rate < ranges['normal'][0]:
-            category = 'low'
-            status = '偏低'
-        elif heart_rate <= ranges['normal'][1]:
-            category = 'normal'
-            status = '正常'
-        else:
-            category = 'high'
-            status = '偏高'
-        
-        return {
-            'indicator': '心率',
-            'user_value': heart_rate,
-            'unit': '次/分钟',
-            'age_group': age_group,
-            'gender': gender,
-            'normal_range': ranges['normal'],
-            'is_normal': is_normal,
-            'category': category,
-            'status': status,
-            'deviation': self._calculate_deviation(heart_rate, ranges['normal']),
-            'standard_info': {
-                'low_range': [0, ranges['normal'][0]],
-                'normal_range': ranges['normal'],
-                'high_range': [ranges['normal'][1], 200]
+        category, status = _HR_CATEGORIES[(heart_rate >= normal_min) + (heart_rate > normal_max)]
+        
+        return HeartRateComparison(
+            indicator='心率',
+            user_value=heart_rate,
+            unit='次/分钟',
+            age_group=age_group,
+            gender=gender,
+            normal_range=normal_range,
+            is_normal=is_normal,
+            category=category,
+            status=status,
+            deviation=self._calculate_deviation(heart_rate, normal_range),
+            standard_info={
+                'low_range': [0, normal_min],
+                'normal_range': normal_range,
+                'high_range': [normal_max, 200]
             }
-        }
+        )
     
-    def compare_sleep(self, sleep_hours: float, age: int, gender: str) -> Dict[str, Any]:
+    def compare_sleep(self, sleep_hours: float, age: int, gender: str) -> SleepComparison:
         """对比睡眠指标与标准范围"""
         age_group = self.get_age_group(age)
-        ranges = self.standards['health_indicators']['sleep_hours']['ranges'][gender][age_group]
+        optimal_min, optimal_max, acceptable_max = self._sleep_ranges[(gender, age_group)]
+        optimal_range = [optimal_min, optimal_max]
         
         # 判断是否在最佳范围内
-        is_optimal = ranges['optimal'][0] <= sleep_hours <= ranges['optimal'][1]
+        is_optimal = optimal_min <= sleep_hours <= optimal_max
         
         # 确定分类
-        if sleep_hours < ranges['optimal'][0]:
-            category = 'insufficient'
-            status = '不足'
-        elif sleep_hours <= ranges['optimal'][1]:
-            category = 'optimal'
-            status = '充足'
-        elif sleep_hours <= ranges['acceptable'][1]:
-            category = 'acceptable'
-            status = '可接受'
-        else:
-            category = 'excessive'
-            status = '过多'
-        
-        return {
-            'indicator': '睡眠时间',
-            'user_value': sleep_hours,
-            'unit': '小时',
-            'age_group': age_group,
-            'gender': gender,
-            'optimal_range': ranges['optimal'],
-            'is_optimal': is_optimal,
-            'category': category,
-            'status': status,
-            'deviation': self._calculate_deviation(sleep_hours, ranges['optimal']),
-            'standard_info': {
-                'insufficient_range': [0, ranges['optimal'][0]],
-                'optimal_range': ranges['optimal'],
-                'acceptable_range': [ranges['optimal'][1], ranges['acceptable'][1]],
-                'excessive_range': [ranges['acceptable'][1], 24]
+        category, status = _SLEEP_CATEGORIES[(sleep_hours >= optimal_min) + (sleep_hours > optimal_max) + (sleep_hours > acceptable_max)]
+        
+        return SleepComparison(
+            indicator='睡眠时间',
+            user_value=sleep_hours,
+            unit='小时',
+            age_group=age_group,
+            gender=gender,
+            optimal_range=optimal_range,
+            is_optimal=is_optimal,
+            category=category,
+            status=status,
+            deviation=self._calculate_deviation(sleep_hours, optimal_range),
+            standard_info={
+                'insufficient_range': [0, optimal_min],
+                'optimal_range': optimal_range,
+                'acceptable_range': [optimal_max, acceptable_max],
+                'excessive_range': [acceptable_max, 24]
             }
-        }
+        )
     
-    def compare_lifestyle(self, profile: HealthProfile) -> Dict[str, Any]:
-        """对比生活方式指标与标准"""
-        lifestyle = profile.lifestyle
-        
-        # 运动频率对比
-        exercise_standard = self.standards['lifestyle_standards']['exercise_frequency']['categories']
-        exercise_info = exercise_standard.get(lifestyle.exercise_frequency, {})
-        
-        # 睡眠质量对比
-        sleep_standard = self.standards['lifestyle_standards']['sleep_quality']['categories']
-        sleep_info = sleep_standard.get(lifestyle.sleep_quality, {})
-        
-        # 压力水平对比
-        stress_standard = self.standards['lifestyle_standards']['stress_level']['categories']
-        stress_info = stress_standard.get(lifestyle.stress_level, {})
-        
-        # 饮酒频率对比
-        alcohol_standard = self.standards['lifestyle_standards']['alcohol_consumption']['categories']
-        alcohol_info = alcohol_standard.get(lifestyle.alcohol_consumption, {})
-        
-        # 吸烟对比
-        smoking_status = '不吸烟' if not lifestyle.smoking else '吸烟'
-        
-        return {
-            'exercise_frequency': {
-                'user_value': lifestyle.exercise_frequency,
-                'standard_info': exercise_info,
-                'is_optimal': lifestyle.exercise_frequency in ['每周3-4次', '每周5次以上']
-            },
-            'sleep_quality': {
-                'user_value': lifestyle.sleep_quality,
-                'standard_info': sleep_info,
-                'is_optimal': lifestyle.sleep_quality in ['好', '很好']
-            },
-            'stress_level': {
-                'user_value': lifestyle.stress_level,
-                'standard_info': stress_info,
-                'is_optimal': lifestyle.stress_level in ['低', '很低']
-            },
-            'alcohol_consumption': {
-                'user_value': lifestyle.alcohol_consumption,
-                'standard_info': alcohol_info,
-                'is_optimal': lifestyle.alcohol_consumption in ['无', '偶尔']
-            },
-            'smoking': {
-                'user_value': smoking_status,
-                'is_optimal': not lifestyle.smoking
-            }
-        }
-    
-    def compare_health_risks(self, profile: HealthProfile) -> Dict[str, Any]:
-        """对比健康风险因素"""
-        risk_factors = []
-        
-        # 慢性病风险
-        for condition in profile.health_status.chronic_conditions:
-            if condition in self.standards['health_risk_factors']['chronic_diseases']:
-                risk_info = self.standards['health_risk_factors']['chronic_diseases'][condition]
-                risk_factors.append({
-                    'type': 'chronic_disease',
-                    'name': condition,
-                    'level': risk_info['risk_level'],
-                    'prevention': risk_info['prevention'],
-                    'has_condition': True
+    def _walk_lifestyle(self, lifestyle) -> Tuple[LifestyleComparison, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """单次遍历生活方式指标，同时生成对比结果、异常指标和生活方式风险因素"""
+        lifestyle_standards = self.standards['lifestyle_standards']
+        lifestyle_risks = self.standards['health_risk_factors']['lifestyle_risks']
+        comparison = {}
+        abnormals = []
+        risks = []
+        
+        def record(key: str, entry: Dict[str, Any]) -> None:
+            comparison[key] = entry
+            if not entry['is_optimal']:
+                abnormals.append({
+                    'indicator': key,
+                    'user_value': entry['user_value'],
+                    'is_optimal': False
                 })
         
-        # 生活方式风险
-        if profile.lifestyle.smoking:
-            risk_factors.append({
+        # 吸烟（风险因素排在生活方式风险首位）
+        smoking = lifestyle.smoking
+        if smoking:
+            risks.append({
                 'type': 'lifestyle',
                 'name': '吸烟',
                 'level': 'high',
-                'prevention': self.standards['health_risk_factors']['lifestyle_risks']['smoking']['prevention'],
+                'prevention': lifestyle_risks['smoking']['prevention'],
                 'has_condition': True
             })
         
-        if profile.lifestyle.exercise_frequency == '无':
-            risk_factors.append({
+        # 运动频率对比
+        exercise = lifestyle.exercise_frequency
+        record('exercise_frequency', {
+            'user_value': exercise,
+            'standard_info': lifestyle_standards['exercise_frequency']['categories'].get(exercise, {}),
+            'is_optimal': exercise in ['每周3-4次', '每周5次以上']
+        })
+        if exercise == '无':
+            risks.append({
                 'type': 'lifestyle',
                 'name': '缺乏运动',
                 'level': 'medium',
-                'prevention': self.standards['health_risk_factors']['lifestyle_risks']['sedentary']['prevention'],
+                'prevention': lifestyle_risks['sedentary']['prevention'],
                 'has_condition': True
             })
         
-        if profile.lifestyle.sleep_quality in ['很差', '差']:
-            risk_factors.append({
+        # 睡眠质量对比
+        sleep_quality = lifestyle.sleep_quality
+        record('sleep_quality', {
+            'user_value': sleep_quality,
+            'standard_info': lifestyle_standards['sleep_quality']['categories'].get(sleep_quality, {}),
+            'is_optimal': sleep_quality in ['好', '很好']
+        })
+        if sleep_quality in ['很差', '差']:
+            risks.append({
                 'type': 'lifestyle',
                 'name': '睡眠质量差',
                 'level': 'medium',
-                'prevention': self.standards['health_risk_factors']['lifestyle_risks']['poor_sleep']['prevention'],
+                'prevention': lifestyle_risks['poor_sleep']['prevention'],
                 'has_condition': True
             })
         
-        if profile.lifestyle.stress_level in ['很高', '高']:
-            risk_factors.append({
+        # 压力水平对比
+        stress = lifestyle.stress_level
+        record('stress_level', {
+            'user_value': stress,
+            'standard_info': lifestyle_standards['stress_level']['categories'].get(stress, {}),
+            'is_optimal': stress in ['低', '很低']
+        })
+        if stress in ['很高', '高']:
+            risks.append({
                 'type': 'lifestyle',
                 'name': '压力过大',
                 'level': 'medium',
-                'prevention': self.standards['health_risk_factors']['lifestyle_risks']['high_stress']['prevention'],
+                'prevention': lifestyle_risks['high_stress']['prevention'],
                 'has_condition': True
             })
         
-        return {
-            'risk_factors': risk_factors,
-            'total_risk_factors': len(risk_factors),
-            'chronic_diseases': len([r for r in risk_factors if r['type'] == 'chronic_disease']),
-            'lifestyle_risks': len([r for r in risk_factors if r['type'] == 'lifestyle'])
-        }
+        # 饮酒频率对比
+        alcohol = lifestyle.alcohol_consumption
+        record('alcohol_consumption', {
+            'user_value': alcohol,
+            'standard_info': lifestyle_standards['alcohol_consumption']['categories'].get(alcohol, {}),
+            'is_optimal': alcohol in ['无', '偶尔']
+        })
+        
+        # 吸烟对比
+        record('smoking', {
+            'user_value': '吸烟' if smoking else '不吸烟',
+            'is_optimal': not smoking
+        })
+        
+        return LifestyleComparison(**comparison), abnormals, risks
     
-    def comprehensive_comparison(self, profile: HealthProfile) -> Dict[str, Any]:
+    def compare_lifestyle(self, profile: 'HealthProfile') -> LifestyleComparison:
+        """对比生活方式指标与标准"""
+        return self._walk_lifestyle(profile.lifestyle)[0]
+    
+    def _summarize_risks(self, chronic_conditions: List[str], lifestyle_risks: List[Dict[str, Any]]) -> RiskComparison:
+        """汇总慢性病风险与生活方式风险"""
+        risk_factors = []
+        chronic_count = 0
+        
+        # 慢性病风险（按用户记录顺序匹配标准中的慢性病）
+        chronic_std = self._chronic_std
+        for condition in chronic_conditions:
+            risk_info = chronic_std.get(condition)
+            if risk_info is not None:
+                risk_factors.append({
+                    'type': 'chronic_disease',
+                    'name': condition,
+                    'level': risk_info['risk_level'],
+                    'prevention': risk_info['prevention'],
+                    'has_condition': True
+                })
+                chronic_count += 1
+        
+        # 生活方式风险
+        risk_factors.extend(lifestyle_risks)
+        
+        return RiskComparison(
+            risk_factors=risk_factors,
+            total_risk_factors=len(risk_factors),
+            chronic_diseases=chronic_count,
+            lifestyle_risks=len(lifestyle_risks)
+        )
+    
+    def compare_health_risks(self, profile: 'HealthProfile') -> RiskComparison:
+        """对比健康风险因素"""
+        return self._summarize_risks(profile.health_status.chronic_conditions, self._walk_lifestyle(profile.lifestyle)[2])
+    
+    def comprehensive_comparison(self, profile: 'HealthProfile') -> Dict[str, Any]:
         """综合健康指标对比分析"""
-        age = profile.demographics.age
-        gender = profile.demographics.gender
+        demographics = profile.demographics
+        age = demographics.age
+        gender = demographics.gender
         
         # 基础指标对比
-        bmi_comparison = self.compare_bmi(profile.demographics.calculate_bmi(), age, gender)
+        bmi_comparison = self.compare_bmi(demographics.calculate_bmi(), age, gender)
         
-        # 生活方式对比
-        lifestyle_comparison = self.compare_lifestyle(profile)
+        # 生活方式对比（一次遍历同时得到异常指标和风险因素）
+        lifestyle_comparison, lifestyle_abnormals, lifestyle_risks = self._walk_lifestyle(profile.lifestyle)
         
         # 健康风险对比
-        risk_comparison = self.compare_health_risks(profile)
+        risk_comparison = self._summarize_risks(profile.health_status.chronic_conditions, lifestyle_risks)
         
         # 统计不符合标准的指标
         abnormal_indicators = []
         
         # 检查BMI
-        if not bmi_comparison['is_normal']:
+        if not bmi_comparison.is_normal:
             abnormal_indicators.append({
                 'indicator': 'BMI',
-                'user_value': bmi_comparison['user_value'],
-                'normal_range': bmi_comparison['normal_range'],
-                'deviation': bmi_comparison['deviation']
+                'user_value': bmi_comparison.user_value,
+                'normal_range': bmi_comparison.normal_range,
+                'deviation': bmi_comparison.deviation
             })
         
-        # 检查生活方式
-        for key, value in lifestyle_comparison.items():
-            if not value.get('is_optimal', True):
-                abnormal_indicators.append({
-                    'indicator': key,
-                    'user_value': value['user_value'],
-                    'is_optimal': value['is_optimal']
-                })
+        # 生活方式异常指标
+        abnormal_indicators.extend(lifestyle_abnormals)
         
         return {
             'user_id': profile.user_id,
             'age': age,
             'gender': gender,
-            'age_group': bmi_comparison['age_group'],
+            'age_group': bmi_comparison.age_group,
             'comparison_date': profile.updated_at.isoformat(),
-            'bmi_comparison': bmi_comparison,
-            'lifestyle_comparison': lifestyle_comparison,
-            'risk_comparison': risk_comparison,
+            'bmi_comparison': bmi_comparison.to_dict(),
+            'lifestyle_comparison': lifestyle_comparison.to_dict(),
+            'risk_comparison': risk_comparison.to_dict(),
             'abnormal_indicators': abnormal_indicators,
             'total_abnormal': len(abnormal_indicators),
             'summary': self._generate_comparison_summary(abnormal_indicators, risk_comparison)
         }
     
-    def _generate_comparison_summary(self, abnormal_indicators: List[Dict], risk_comparison: Dict) -> Dict[str, Any]:
+    def _generate_comparison_summary(self, abnormal_indicators: List[Dict], risk_comparison: RiskComparison) -> Dict[str, Any]:
         """生成对比分析摘要"""
         summary = {
             'total_indicators_checked': 6,  # BMI + 5个生活方式指标
             'abnormal_count': len(abnormal_indicators),
             'normal_count': 6 - len(abnormal_indicators),
             'abnormal_percentage': (len(abnormal_indicators) / 6) * 100,
-            'risk_factors_count': risk_comparison['total_risk_factors'],
-            'chronic_diseases_count': risk_comparison['chronic_diseases'],
-            'lifestyle_risks_count': risk_comparison['lifestyle_risks']
+            'risk_factors_count': risk_comparison.total_risk_factors,
+            'chronic_diseases_count': risk_comparison.chronic_diseases,
+            'lifestyle_risks_count': risk_comparison.lifestyle_risks
         }
         
         # 生成状态描述
@@ -9,40 +9,184 @@
 
 import json
 import os
-import sys
-from typing import Dict, List, Any, Optional
+import time
+import threading
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
+from types import MappingProxyType
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
-# 添加项目路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
 
 from qwen_agent.tools.base import BaseTool, register_tool
 from src.user_profile import HealthProfile, HealthProfileManager
-from tools.health_comparison import HealthComparison
+from tools.health_comparison import HealthComparison, _ComparisonResult
 
 logger = logging.getLogger(__name__)
 
+# 模块所在目录和项目根目录，导入时计算一次
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_MODULE_DIR)
+
+_json_loads = orjson.loads if orjson else json.loads
+
+# 设置 HMT_DEBUG_JSON=1 时输出带缩进的JSON，便于调试；默认输出紧凑格式
+DEBUG_JSON = os.environ.get('HMT_DEBUG_JSON') == '1'
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if DEBUG_JSON else 0)
+    
+    def _dumps(obj: Any) -> str:
+        """序列化工具返回结果"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode('utf-8')
+else:
+    _JSON_KWARGS = {"indent": 2} if DEBUG_JSON else {"separators": (',', ':')}
+    
+    def _dumps(obj: Any) -> str:
+        """序列化工具返回结果"""
+        return json.dumps(obj, ensure_ascii=False, **_JSON_KWARGS)
+
+# 参与趋势分析的健康数据类型
+_TREND_TYPES = ('血压', '体重', '心率', '步数', '睡眠')
+
+def _point_value(point: Dict[str, Any]) -> Any:
+    """取数据点的数值，血压等复合数据取收缩压，无法取值时返回None"""
+    value = point.get('value')
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, dict) and 'systolic' in value:
+        return value['systolic']
+    return None
+
+def _to_numeric(data_points: List[Dict[str, Any]]) -> np.ndarray:
+    """将数据点序列转换为浮点数组，无效数据点记为NaN，与原序列逐位对应"""
+    return np.fromiter(
+        (np.nan if value is None else value for value in map(_point_value, data_points)),
+        dtype=np.float64, count=len(data_points)
+    )
+
+class _TTLCache:
+    """带有效期的LRU结果缓存（线程安全）"""
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def get(self, key: str) -> Any:
+        """获取缓存值，不存在或已过期时返回None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """写入缓存值，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: str) -> None:
+        """删除缓存值"""
+        with self._lock:
+            self._data.pop(key, None)
+
+class _ToolResult(_ComparisonResult):
+    """工具结果基类，复用对比结果基类的字典转换及复制、序列化支持"""
+    __slots__ = ()
+
+@dataclass(frozen=True)
+class HealthAnalysis(_ToolResult):
+    """健康分析结果"""
+    __slots__ = ('user_id', 'analysis_date', 'current_status', 'trend_analysis',
+                 'key_findings', 'recommendations')
+    user_id: str
+    analysis_date: str
+    current_status: Dict[str, Any]
+    trend_analysis: Dict[str, Any]
+    key_findings: List[str]
+    recommendations: List[str]
+
+@dataclass(frozen=True)
+class HealthPlan(_ToolResult):
+    """个性化健康计划"""
+    __slots__ = ('user_id', 'plan_date', 'target_period', 'current_status', 'goals',
+                 'action_plan', 'monitoring_plan', 'timeline')
+    user_id: str
+    plan_date: str
+    target_period: str
+    current_status: Dict[str, Any]
+    goals: List[Dict[str, Any]]
+    action_plan: List[Dict[str, Any]]
+    monitoring_plan: Dict[str, Any]
+    timeline: List[Dict[str, Any]]
+
+@dataclass(frozen=True)
+class RiskAssessment(_ToolResult):
+    """疾病风险评估结果"""
+    __slots__ = ('user_id', 'assessment_date', 'overall_risk_level', 'disease_risks',
+                 'risk_factors', 'prevention_recommendations')
+    user_id: str
+    assessment_date: str
+    overall_risk_level: str
+    disease_risks: List[Dict[str, Any]]
+    risk_factors: Dict[str, Any]
+    prevention_recommendations: List[str]
+
 class HealthDataExtractor:
     """健康数据提取器"""
     
     def __init__(self, profiles_dir: str = "data/profiles"):
         self.profiles_dir = profiles_dir
+        # 用户数据目录的绝对路径（相对于项目根目录）
+        self._profiles_path = os.path.join(_PROJECT_ROOT, profiles_dir)
         self.profile_manager = HealthProfileManager(profiles_dir)
         self.comparison_tool = HealthComparison()
-        # 初始化时加载所有用户数据
-        self._load_profiles()
+        # 对比分析结果缓存: user_id -> (画像对象, 画像更新时间, 对比结果)
+        self._comparison_cache = _TTLCache(maxsize=1024, ttl=600)
+        # 数值化历史数据缓存: user_id -> (画像对象, 画像更新时间, {数据类型: 数组})
+        self._numeric_cache = _TTLCache(maxsize=1024, ttl=600)
+        # 已加载画像对应文件的修改时间: user_id -> st_mtime_ns，文件变化时重新加载
+        self._profile_mtimes: Dict[str, int] = {}
+        # 保护按需加载画像时对画像管理器的写入
+        self._cache_lock = threading.RLock()
+        # 用户数据按需加载，首次访问某个用户时才读取其画像文件
     
-    def _load_profiles(self):
-        """加载所有用户数据"""
+    def warm_all(self):
+        """预先加载所有用户数据"""
         try:
-            # 获取项目根目录
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(current_dir)
-            profiles_path = os.path.join(project_root, self.profiles_dir)
+            profiles_path = self._profiles_path
             
             if os.path.exists(profiles_path):
+                # 先记录文件修改时间再加载，加载期间被修改的文件会在下次访问时重新读取
+                with os.scandir(profiles_path) as entries:
+                    mtimes = {
+                        entry.name[:-len("_profile.json")]: entry.stat().st_mtime_ns
+                        for entry in entries
+                        if entry.name.endswith("_profile.json") and entry.is_file()
+                    }
                 self.profile_manager.load_all_profiles(profiles_path)
+                with self._cache_lock:
+                    self._profile_mtimes.update(mtimes)
                 logger.info(f"成功加载 {len(self.profile_manager.profiles)} 个用户数据")
             else:
                 logger.warning(f"用户数据目录不存在: {profiles_path}")
@@ -51,36 +195,77 @@ class HealthDataExtractor:
     
     def get_user_profile(self, user_id: str) -> Optional[HealthProfile]:
         """获取用户健康画像"""
+        # 从已加载的数据中获取，如果内存中没有或画像文件已被修改，只加载该用户的画像文件
         try:
-            # 从已加载的数据中获取
-            profile = self.profile_manager.get_profile(user_id)
-            if profile:
+            mtime = os.stat(self._profile_file(user_id)).st_mtime_ns
+        except OSError:
+            mtime = None
+        profile = self._get_cached(user_id)
+        if profile is not None:
+            # 文件不存在时沿用内存中的画像；由其他途径加载的画像以当前文件时间为基准
+            if mtime is None or self._profile_mtimes.setdefault(user_id, mtime) == mtime:
                 return profile
-            
-            # 如果内存中没有，尝试从文件加载
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(current_dir)
-            filepath = os.path.join(project_root, self.profiles_dir, f"{user_id}_profile.json")
-            
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return HealthProfile.from_dict(data)
+            self.invalidate(user_id)
+        return self._load_from_disk(user_id, mtime)
+    
+    def _profile_file(self, user_id: str) -> Path:
+        """用户画像文件路径"""
+        return Path(self._profiles_path, f"{user_id}_profile.json")
+    
+    def _get_cached(self, user_id: str) -> Optional[HealthProfile]:
+        """从画像管理器中获取已加载的用户画像"""
+        return self.profile_manager.get_profile(user_id)
+    
+    def _load_from_disk(self, user_id: str, mtime: Optional[int] = None) -> Optional[HealthProfile]:
+        """从文件加载单个用户画像，文件不存在或内容无效时返回None"""
+        filepath = self._profile_file(user_id)
+        try:
+            # 一次性读取整个文件后解析
+            with open(filepath, 'rb') as f:
+                data = _json_loads(f.read())
+            profile = HealthProfile.from_dict(data)
+        except FileNotFoundError:
             return None
-        except Exception as e:
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # ValueError 涵盖 json/orjson 的解析错误和无效的时间格式
             logger.error(f"获取用户画像失败: {e}")
             return None
+        # 缓存到画像管理器，后续调用不再读取文件；并发加载同一用户时以先写入的画像为准
+        with self._cache_lock:
+            if mtime is not None:
+                self._profile_mtimes[user_id] = mtime
+            return self.profile_manager.profiles.setdefault(user_id, profile)
+    
+    def invalidate(self, user_id: str) -> None:
+        """清除用户的缓存数据，下次访问时从文件重新加载"""
+        with self._cache_lock:
+            self.profile_manager.profiles.pop(user_id, None)
+            self._profile_mtimes.pop(user_id, None)
+        self._comparison_cache.pop(user_id)
+        self._numeric_cache.pop(user_id)
+        _comparison_index_cache.pop(user_id)
+        for engine in (HealthAnalysisEngine, HealthPlanGenerator, HealthRiskAssessment):
+            engine._cache.pop(user_id)
     
     def get_user_health_comparison(self, user_id: str) -> Optional[Dict[str, Any]]:
         """获取用户健康对比分析结果"""
-        try:
-            profile = self.get_user_profile(user_id)
-            if profile:
-                return self.comparison_tool.comprehensive_comparison(profile)
+        profile = self.get_user_profile(user_id)
+        if not profile:
             return None
-        except Exception as e:
+        
+        # 画像对象和更新时间均未变化时复用上次的对比结果
+        cached = self._comparison_cache.get(user_id)
+        if cached is not None and cached[0] is profile and cached[1] == profile.updated_at:
+            return cached[2]
+        
+        try:
+            comparison = self.comparison_tool.comprehensive_comparison(profile)
+        except (KeyError, TypeError, ValueError) as e:
+            # 画像字段缺失或取值无效
             logger.error(f"获取健康对比分析失败: {e}")
             return None
+        self._comparison_cache.set(user_id, (profile, profile.updated_at, comparison))
+        return comparison
     
     def get_user_health_trend(self, user_id: str, days: int = 30) -> Dict[str, Any]:
         """获取用户健康趋势数据"""
@@ -90,65 +275,82 @@ class HealthDataExtractor:
                 return {"error": "用户数据不存在"}
             
             trend_data = {}
+            numeric_data = {}
             
-            # 获取各种健康数据的历史趋势
-            for data_type in ['血压', '体重', '心率', '步数', '睡眠']:
-                if data_type in profile.health_data_history:
-                    data_points = profile.health_data_history[data_type]
-                    # 获取最近N天的数据
-                    recent_data = data_points[-days:] if len(data_points) >= days else data_points
-                    trend_data[data_type] = recent_data
+            # 获取各种健康数据的历史趋势，按固定顺序输出
+            history = profile.health_data_history
+            numeric_history = self._get_numeric_history(user_id, profile)
+            for data_type in _TREND_TYPES:
+                if data_type in history:
+                    # 获取最近N天的数据，数值数组同步切片（视图，不复制）
+                    trend_data[data_type] = history[data_type][-days:]
+                    numeric_data[data_type] = numeric_history[data_type][-days:]
             
             return {
                 "user_id": user_id,
                 "trend_period": f"最近{days}天",
                 "data_points": trend_data,
-                "summary": self._analyze_trend_summary(trend_data)
+                "summary": self._analyze_trend_summary(trend_data, numeric_data)
             }
         except Exception as e:
             logger.error(f"获取健康趋势失败: {e}")
             return {"error": str(e)}
     
-    def _analyze_trend_summary(self, trend_data: Dict[str, List]) -> Dict[str, Any]:
+    def _get_numeric_history(self, user_id: str, profile: HealthProfile) -> Dict[str, np.ndarray]:
+        """获取用户各类历史数据的数值数组，画像未变化时复用上次的转换结果"""
+        cached = self._numeric_cache.get(user_id)
+        if cached is not None and cached[0] is profile and cached[1] == profile.updated_at:
+            return cached[2]
+        history = profile.health_data_history
+        numeric_history = {data_type: _to_numeric(history[data_type]) for data_type in _TREND_TYPES if data_type in history}
+        self._numeric_cache.set(user_id, (profile, profile.updated_at, numeric_history))
+        return numeric_history
+    
+    def _analyze_trend_summary(self, trend_data: Dict[str, List],
+                               numeric_data: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
         """分析趋势摘要"""
         summary = {}
         
         for data_type, data_points in trend_data.items():
             if not data_points:
                 continue
-                
-            values = []
-            for point in data_points:
-                if isinstance(point.get('value'), (int, float)):
-                    values.append(point['value'])
-                elif isinstance(point.get('value'), dict):
-                    # 处理血压等复合数据
-                    if 'systolic' in point['value']:
-                        values.append(point['value']['systolic'])
             
-            if values:
+            # 数值数据直接取值，血压等复合数据取收缩压；无效数据点为NaN
+            array = numeric_data[data_type] if numeric_data is not None else _to_numeric(data_points)
+            valid = ~np.isnan(array)
+            count = int(np.count_nonzero(valid))
+            
+            if count:
+                if count < array.size:
+                    last_index = int(np.flatnonzero(valid)[-1])
+                    array = array[valid]
+                else:
+                    last_index = array.size - 1
                 summary[data_type] = {
-                    "count": len(values),
-                    "latest": values[-1],
-                    "average": sum(values) / len(values),
-                    "trend": self._calculate_trend(values)
+                    "count": count,
+                    # 最新值保留原始数据类型
+                    "latest": _point_value(data_points[last_index]),
+                    "average": float(array.mean()),
+                    "trend": self._calculate_trend(array)
                 }
         
         return summary
     
-    def _calculate_trend(self, values: List[float]) -> str:
+    def _calculate_trend(self, values: np.ndarray) -> str:
         """计算数据趋势"""
         if len(values) < 2:
             return "数据不足"
         
-        # 简单线性趋势分析
-        first_half = values[:len(values)//2]
-        second_half = values[len(values)//2:]
-        
-        first_avg = sum(first_half) / len(first_half)
-        second_avg = sum(second_half) / len(second_half)
+        mean = values.mean()
+        if mean == 0:
+            return "稳定"
         
-        change_percent = ((second_avg - first_avg) / first_avg) * 100
+        # 先做移动平均平滑噪声（窗口最多7个点，且保证至少剩2个平滑点），
+        # 再用平滑序列的线性回归斜率换算为整个区间的变化百分比
+        window = min(7, len(values) - 1)
+        smoothed = np.convolve(values, np.ones(window) / window, mode='valid')
+        slope, _ = np.polyfit(np.arange(smoothed.size), smoothed, 1)
+        change_percent = slope * smoothed.size / mean * 100
         
         if abs(change_percent) < 2:
             return "稳定"
@@ -157,11 +359,54 @@ class HealthDataExtractor:
         else:
             return f"下降 {abs(change_percent):.1f}%"
 
+@functools.lru_cache(maxsize=1)
+def _get_extractor() -> HealthDataExtractor:
+    """获取进程内共享的健康数据提取器，避免每次工具调用重新加载用户数据"""
+    return HealthDataExtractor()
+
+# 监测计划和计划时间线与用户无关，模板只读，每个计划取用时复制一份
+_MONITORING_PLAN = MappingProxyType({
+    "daily": ("体重", "血压", "步数"),
+    "weekly": ("运动频率", "睡眠质量"),
+    "monthly": ("BMI", "健康评估")
+})
+
+_TIMELINE = (
+    MappingProxyType({"week": "1-2周", "focus": "建立健康习惯", "target": "适应新的饮食和运动计划"}),
+    MappingProxyType({"week": "3-4周", "focus": "巩固习惯", "target": "形成稳定的健康生活方式"}),
+    MappingProxyType({"week": "5-8周", "focus": "优化调整", "target": "根据效果调整计划"}),
+    MappingProxyType({"week": "9-12周", "focus": "长期维持", "target": "建立长期健康管理机制"})
+)
+
+# 对比结果索引缓存: user_id -> (对比结果, 索引)
+_comparison_index_cache = _TTLCache(maxsize=512, ttl=300)
+
+def _index_comparison(comparison: Dict[str, Any]) -> Dict[str, Any]:
+    """为对比结果建立按指标名和风险类型的索引，同一对比结果只建立一次"""
+    user_id = comparison.get('user_id')
+    cached = _comparison_index_cache.get(user_id)
+    if cached is not None and cached[0] is comparison:
+        return cached[1]
+    
+    risk_factors = comparison.get('risk_comparison', {}).get('risk_factors', [])
+    index = {
+        'by_indicator': {item['indicator']: item for item in comparison.get('abnormal_indicators', [])},
+        'lifestyle_risks': [rf for rf in risk_factors if rf['type'] == 'lifestyle'],
+        'chronic_risks': [rf for rf in risk_factors if rf['type'] == 'chronic_disease'],
+        # 按出现顺序去重的预防建议
+        'prevention': list(dict.fromkeys(chain.from_iterable(rf.get('prevention', []) for rf in risk_factors)))
+    }
+    _comparison_index_cache.set(user_id, (comparison, index))
+    return index
+
 class HealthAnalysisEngine:
     """健康分析引擎"""
     
+    # 分析结果缓存: user_id -> (对比结果, 分析结果)，对比结果对象变化即失效
+    _cache = _TTLCache(maxsize=512, ttl=300)
+    
     def __init__(self):
-        self.data_extractor = HealthDataExtractor()
+        self.data_extractor = _get_extractor()
     
     def analyze_health_trend(self, user_id: str) -> Dict[str, Any]:
         """分析健康趋势"""
@@ -171,24 +416,34 @@ class HealthAnalysisEngine:
             if not comparison:
                 return {"error": "无法获取用户健康对比数据"}
             
+            # 对比结果未变化（画像未更新）时复用上次的分析结果
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[0] is comparison:
+                return cached[1]
+            
             # 获取健康趋势数据
             trend_data = self.data_extractor.get_user_health_trend(user_id)
             
             # 综合分析
-            analysis = {
-                "user_id": user_id,
-                "analysis_date": datetime.now().isoformat(),
-                "current_status": comparison,
-                "trend_analysis": trend_data,
-                "key_findings": self._extract_key_findings(comparison, trend_data),
-                "recommendations": self._generate_recommendations(comparison, trend_data)
-            }
+            analysis = self._build_analysis(user_id, comparison, trend_data).to_dict()
             
+            self._cache.set(user_id, (comparison, analysis))
             return analysis
         except Exception as e:
             logger.error(f"健康趋势分析失败: {e}")
             return {"error": str(e)}
     
+    def _build_analysis(self, user_id: str, comparison: Dict, trend_data: Dict) -> HealthAnalysis:
+        """根据对比分析和趋势数据组装健康分析结果"""
+        return HealthAnalysis(
+            user_id=user_id,
+            analysis_date=datetime.now().isoformat(),
+            current_status=comparison,
+            trend_analysis=trend_data,
+            key_findings=self._extract_key_findings(comparison, trend_data),
+            recommendations=self._generate_recommendations(comparison, trend_data)
+        )
+    
     def _extract_key_findings(self, comparison: Dict, trend_data: Dict) -> List[str]:
         """提取关键发现"""
         findings = []
@@ -210,27 +465,30 @@ class HealthAnalysisEngine:
     
     def _generate_recommendations(self, comparison: Dict, trend_data: Dict) -> List[str]:
         """生成建议"""
+        index = _index_comparison(comparison)
         recommendations = []
         
         # 基于异常指标的建议
-        for indicator in comparison.get('abnormal_indicators', []):
-            if indicator['indicator'] == 'BMI':
-                if indicator['user_value'] > 25:
-                    recommendations.append("建议控制饮食，增加运动，适当减重")
-                else:
-                    recommendations.append("建议增加营养摄入，适当增重")
+        bmi_indicator = index['by_indicator'].get('BMI')
+        if bmi_indicator:
+            if bmi_indicator['user_value'] > 25:
+                recommendations.append("建议控制饮食，增加运动，适当减重")
+            else:
+                recommendations.append("建议增加营养摄入，适当增重")
         
         # 基于风险因素的建议
-        for risk in comparison.get('risk_comparison', {}).get('risk_factors', []):
-            recommendations.extend(risk.get('prevention', []))
+        recommendations.extend(index['prevention'])
         
-        return list(set(recommendations))  # 去重
+        return list(dict.fromkeys(recommendations))  # 去重并保持顺序
 
 class HealthPlanGenerator:
     """健康计划生成器"""
     
+    # 健康计划缓存: user_id -> (对比结果, 健康计划)，对比结果对象变化即失效
+    _cache = _TTLCache(maxsize=512, ttl=300)
+    
     def __init__(self):
-        self.data_extractor = HealthDataExtractor()
+        self.data_extractor = _get_extractor()
     
     def generate_personalized_plan(self, user_id: str) -> Dict[str, Any]:
         """生成个性化健康计划"""
@@ -239,30 +497,40 @@ class HealthPlanGenerator:
             if not comparison:
                 return {"error": "无法获取用户健康数据"}
             
+            # 对比结果未变化（画像未更新）时复用上次的结果
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[0] is comparison:
+                return cached[1]
+            
             profile = self.data_extractor.get_user_profile(user_id)
             if not profile:
                 return {"error": "无法获取用户画像"}
             
-            plan = {
-                "user_id": user_id,
-                "plan_date": datetime.now().isoformat(),
-                "target_period": "3个月",
-                "current_status": {
-                    "bmi_status": comparison['bmi_comparison']['status'],
-                    "abnormal_indicators": comparison['total_abnormal'],
-                    "risk_factors": comparison['risk_comparison']['total_risk_factors']
-                },
-                "goals": self._generate_goals(comparison, profile),
-                "action_plan": self._generate_action_plan(comparison, profile),
-                "monitoring_plan": self._generate_monitoring_plan(profile),
-                "timeline": self._generate_timeline()
-            }
+            plan = self._build_plan(user_id, comparison, profile).to_dict()
             
+            self._cache.set(user_id, (comparison, plan))
             return plan
         except Exception as e:
             logger.error(f"生成健康计划失败: {e}")
             return {"error": str(e)}
     
+    def _build_plan(self, user_id: str, comparison: Dict, profile: HealthProfile) -> HealthPlan:
+        """根据对比分析和用户画像组装健康计划"""
+        return HealthPlan(
+            user_id=user_id,
+            plan_date=datetime.now().isoformat(),
+            target_period="3个月",
+            current_status={
+                "bmi_status": comparison['bmi_comparison']['status'],
+                "abnormal_indicators": comparison['total_abnormal'],
+                "risk_factors": comparison['risk_comparison']['total_risk_factors']
+            },
+            goals=self._generate_goals(comparison, profile),
+            action_plan=self._generate_action_plan(comparison, profile),
+            monitoring_plan=self._generate_monitoring_plan(profile),
+            timeline=self._generate_timeline()
+        )
+    
     def _generate_goals(self, comparison: Dict, profile: HealthProfile) -> List[Dict[str, Any]]:
         """生成健康目标"""
         goals = []
@@ -295,45 +563,38 @@ class HealthPlanGenerator:
         actions = []
         
         # 基于异常指标的行动
-        for indicator in comparison.get('abnormal_indicators', []):
-            if indicator['indicator'] == 'BMI':
-                actions.append({
-                    "category": "饮食管理",
-                    "action": "控制每日热量摄入",
-                    "frequency": "每日",
-                    "description": "减少高热量食物，增加蔬菜水果"
-                })
-                actions.append({
-                    "category": "运动锻炼",
-                    "action": "有氧运动",
-                    "frequency": "每周3-4次",
-                    "description": "每次30-45分钟中等强度运动"
-                })
+        if 'BMI' in _index_comparison(comparison)['by_indicator']:
+            actions.append({
+                "category": "饮食管理",
+                "action": "控制每日热量摄入",
+                "frequency": "每日",
+                "description": "减少高热量食物，增加蔬菜水果"
+            })
+            actions.append({
+                "category": "运动锻炼",
+                "action": "有氧运动",
+                "frequency": "每周3-4次",
+                "description": "每次30-45分钟中等强度运动"
+            })
         
         return actions
     
     def _generate_monitoring_plan(self, profile: HealthProfile) -> Dict[str, Any]:
         """生成监测计划"""
-        return {
-            "daily": ["体重", "血压", "步数"],
-            "weekly": ["运动频率", "睡眠质量"],
-            "monthly": ["BMI", "健康评估"]
-        }
+        return {period: list(items) for period, items in _MONITORING_PLAN.items()}
     
     def _generate_timeline(self) -> List[Dict[str, Any]]:
         """生成时间线"""
-        return [
-            {"week": "1-2周", "focus": "建立健康习惯", "target": "适应新的饮食和运动计划"},
-            {"week": "3-4周", "focus": "巩固习惯", "target": "形成稳定的健康生活方式"},
-            {"week": "5-8周", "focus": "优化调整", "target": "根据效果调整计划"},
-            {"week": "9-12周", "focus": "长期维持", "target": "建立长期健康管理机制"}
-        ]
+        return [dict(stage) for stage in _TIMELINE]
 
 class HealthRiskAssessment:
     """健康风险评估器"""
     
+    # 风险评估缓存: user_id -> (对比结果, 风险评估)，对比结果对象变化即失效
+    _cache = _TTLCache(maxsize=512, ttl=300)
+    
     def __init__(self):
-        self.data_extractor = HealthDataExtractor()
+        self.data_extractor = _get_extractor()
     
     def assess_disease_risk(self, user_id: str) -> Dict[str, Any]:
         """评估疾病风险"""
@@ -342,24 +603,34 @@ class HealthRiskAssessment:
             if not comparison:
                 return {"error": "无法获取用户健康数据"}
             
+            # 对比结果未变化（画像未更新）时复用上次的结果
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[0] is comparison:
+                return cached[1]
+            
             profile = self.data_extractor.get_user_profile(user_id)
             if not profile:
                 return {"error": "无法获取用户画像"}
             
-            risk_assessment = {
-                "user_id": user_id,
-                "assessment_date": datetime.now().isoformat(),
-                "overall_risk_level": self._calculate_overall_risk(comparison),
-                "disease_risks": self._assess_specific_risks(comparison, profile),
-                "risk_factors": self._analyze_risk_factors(comparison),
-                "prevention_recommendations": self._generate_prevention_plan(comparison, profile)
-            }
+            risk_assessment = self._build_assessment(user_id, comparison, profile).to_dict()
             
+            self._cache.set(user_id, (comparison, risk_assessment))
             return risk_assessment
         except Exception as e:
             logger.error(f"疾病风险评估失败: {e}")
             return {"error": str(e)}
     
+    def _build_assessment(self, user_id: str, comparison: Dict, profile: HealthProfile) -> RiskAssessment:
+        """根据对比分析和用户画像组装风险评估结果"""
+        return RiskAssessment(
+            user_id=user_id,
+            assessment_date=datetime.now().isoformat(),
+            overall_risk_level=self._calculate_overall_risk(comparison),
+            disease_risks=self._assess_specific_risks(comparison, profile),
+            risk_factors=self._analyze_risk_factors(comparison),
+            prevention_recommendations=self._generate_prevention_plan(comparison, profile)
+        )
+    
     def _calculate_overall_risk(self, comparison: Dict) -> str:
         """计算总体风险等级"""
         abnormal_count = comparison.get('total_abnormal', 0)
@@ -399,19 +670,15 @@ class HealthRiskAssessment:
     
     def _analyze_risk_factors(self, comparison: Dict) -> Dict[str, Any]:
         """分析风险因素"""
+        index = _index_comparison(comparison)
         return {
-            "modifiable": [rf['name'] for rf in comparison.get('risk_comparison', {}).get('risk_factors', []) if rf['type'] == 'lifestyle'],
-            "non_modifiable": [rf['name'] for rf in comparison.get('risk_comparison', {}).get('risk_factors', []) if rf['type'] == 'chronic_disease']
+            "modifiable": [rf['name'] for rf in index['lifestyle_risks']],
+            "non_modifiable": [rf['name'] for rf in index['chronic_risks']]
         }
     
     def _generate_prevention_plan(self, comparison: Dict, profile: HealthProfile) -> List[str]:
         """生成预防计划"""
-        recommendations = []
-        
-        for risk in comparison.get('risk_comparison', {}).get('risk_factors', []):
-            recommendations.extend(risk.get('prevention', []))
-        
-        return list(set(recommendations))
+        return list(_index_comparison(comparison)['prevention'])
 
 # 工具类，供Agent调用
 from qwen_agent.tools import BaseTool
@@ -433,11 +700,11 @@ class HealthAnalysisTool(BaseTool):
     def call(self, params: str, **kwargs) -> str:
         """调用健康分析"""
         try:
-            args = json.loads(params)
+            args = _json_loads(params)
             user_id = args['user_id']
             engine = HealthAnalysisEngine()
             result = engine.analyze_health_trend(user_id)
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return _dumps(result)
         except Exception as e:
             logger.error(f"健康分析工具调用失败: {e}")
             return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -459,11 +726,11 @@ class HealthPlanTool(BaseTool):
     def call(self, params: str, **kwargs) -> str:
         """调用健康计划生成"""
         try:
-            args = json.loads(params)
+            args = _json_loads(params)
             user_id = args['user_id']
             generator = HealthPlanGenerator()
             result = generator.generate_personalized_plan(user_id)
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return _dumps(result)
         except Exception as e:
             logger.error(f"健康计划工具调用失败: {e}")
             return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -485,11 +752,47 @@ class HealthRiskTool(BaseTool):
     def call(self, params: str, **kwargs) -> str:
         """调用健康风险评估"""
         try:
-            args = json.loads(params)
+            args = _json_loads(params)
             user_id = args['user_id']
             assessor = HealthRiskAssessment()
             result = assessor.assess_disease_risk(user_id)
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return _dumps(result)
         except Exception as e:
             logger.error(f"健康风险工具调用失败: {e}")
             return json.dumps({"error": str(e)}, ensure_ascii=False)
+
+@register_tool('get_user_health_bundle')
+class HealthBundleTool(BaseTool):
+    """健康综合工具"""
+    
+    description = "一次性获取用户健康分析、个性化健康计划和疾病风险评估，适用于需要同时查看三类结果的场景"
+    parameters = [
+        {
+            "name": "user_id",
+            "type": "string",
+            "description": "用户ID",
+            "required": True
+        }
+    ]
+    
+    def call(self, params: str, **kwargs) -> str:
+        """调用健康综合分析，三类结果共享同一份画像、对比分析和趋势数据"""
+        try:
+            args = _json_loads(params)
+            user_id = args['user_id']
+            extractor = _get_extractor()
+            profile = extractor.get_user_profile(user_id)
+            comparison = extractor.get_user_health_comparison(user_id)
+            if not profile or not comparison:
+                return _dumps({"error": "无法获取用户健康数据"})
+            trend_data = extractor.get_user_health_trend(user_id)
+            result = {
+                "user_id": user_id,
+                "analysis": HealthAnalysisEngine()._build_analysis(user_id, comparison, trend_data).to_dict(),
+                "plan": HealthPlanGenerator()._build_plan(user_id, comparison, profile).to_dict(),
+                "risk": HealthRiskAssessment()._build_assessment(user_id, comparison, profile).to_dict()
+            }
+            return _dumps(result)
+        except Exception as e:
+            logger.error(f"健康综合工具调用失败: {e}")
+            return json.dumps({"error": str(e)}, ensure_ascii=False)
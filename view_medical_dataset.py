@@ -7,6 +7,32 @@
 
 import json
 import os
+import sys
+from itertools import islice
+
+import numpy as np
+
+try:
+    import ijson
+except ImportError:  # ijson 为可选依赖，未安装时一次性加载整个文件
+    ijson = None
+
+# 参与统计的样本数
+SAMPLE_LIMIT = 1000
+
+def load_samples(dataset_file, limit=SAMPLE_LIMIT):
+    """读取数据集的前 limit 个样本，并返回 (样本列表, 总样本数)"""
+    if ijson is None:
+        with open(dataset_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data[:limit], len(data)
+    
+    # 流式解析，内存中只保留前 limit 个样本，其余样本只计数
+    with open(dataset_file, 'rb') as f:
+        items = ijson.items(f, 'item')
+        samples = list(islice(items, limit))
+        total = len(samples) + sum(1 for _ in items)
+    return samples, total
 
 def view_dataset_samples():
     """查看数据集样本"""
@@ -16,34 +42,42 @@ def view_dataset_samples():
         print("❌ 数据集文件不存在，请先下载数据集")
         return
     
-    print("📊 医学推理数据集样本预览")
-    print("=" * 60)
+    # 输出内容先汇总，最后一次性写入标准输出
+    lines = ["📊 医学推理数据集样本预览"]
+    lines.append("=" * 60)
     
-    with open(dataset_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data, total = load_samples(dataset_file)
     
-    print(f"总样本数: {len(data)}")
-    print(f"字段: {list(data[0].keys())}")
+    lines.append(f"总样本数: {total}")
+    lines.append(f"字段: {list(data[0].keys())}")
     
     # 显示前3个样本
     for i in range(min(3, len(data))):
         sample = data[i]
-        print(f"\n📋 样本 {i+1}:")
-        print("-" * 40)
-        print(f"问题: {sample['Question'][:200]}...")
-        print(f"\n推理链: {sample['Complex_CoT'][:300]}...")
-        print(f"\n回答: {sample['Response'][:200]}...")
-        print("-" * 40)
+        lines.append(f"\n📋 样本 {i+1}:")
+        lines.append("-" * 40)
+        lines.append(f"问题: {sample['Question'][:200]}...")
+        lines.append(f"\n推理链: {sample['Complex_CoT'][:300]}...")
+        lines.append(f"\n回答: {sample['Response'][:200]}...")
+        lines.append("-" * 40)
     
     # 统计信息
-    print(f"\n📈 数据集统计:")
-    question_lengths = [len(sample['Question']) for sample in data[:1000]]
-    cot_lengths = [len(sample['Complex_CoT']) for sample in data[:1000]]
-    response_lengths = [len(sample['Response']) for sample in data[:1000]]
-    
-    print(f"问题平均长度: {sum(question_lengths)/len(question_lengths):.0f} 字符")
-    print(f"推理链平均长度: {sum(cot_lengths)/len(cot_lengths):.0f} 字符")
-    print(f"回答平均长度: {sum(response_lengths)/len(response_lengths):.0f} 字符")
+    lines.append(f"\n📈 数据集统计:")
+    # 一次遍历已读取的样本，同时记录三个字段的长度
+    n = len(data)
+    question_lengths = np.empty(n, dtype=np.int32)
+    cot_lengths = np.empty(n, dtype=np.int32)
+    response_lengths = np.empty(n, dtype=np.int32)
+    for i, sample in enumerate(data):
+        question_lengths[i] = len(sample['Question'])
+        cot_lengths[i] = len(sample['Complex_CoT'])
+        response_lengths[i] = len(sample['Response'])
+    
+    lines.append(f"问题平均长度: {question_lengths.mean():.0f} 字符")
+    lines.append(f"推理链平均长度: {cot_lengths.mean():.0f} 字符")
+    lines.append(f"回答平均长度: {response_lengths.mean():.0f} 字符")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == '__main__':
     view_dataset_samples()